@@ -0,0 +1,47 @@
+"""Method call overhead of strict classes, against the same class unchecked.
+
+Run with python bench.py. Plain is defined before strict is imported, so it's
+left alone; Checked is defined afterwards, so its methods are checked."""
+
+import timeit
+
+class Plain:
+    def __init__(self, x: int) -> None:
+        self.x = x
+
+    def add(self, y: int) -> int:
+        return self.x + y
+
+    @classmethod
+    def make(cls, x: int) -> 'Plain':
+        return cls(x)
+
+    @staticmethod
+    def twice(x: int) -> int:
+        return x * 2
+
+import strict
+
+class Checked:
+    def __init__(self, x: int) -> None:
+        self.x = x
+
+    def add(self, y: int) -> int:
+        return self.x + y
+
+    @classmethod
+    def make(cls, x: int) -> 'Checked':
+        return cls(x)
+
+    @staticmethod
+    def twice(x: int) -> int:
+        return x * 2
+
+if __name__ == '__main__':
+    for stmt in ('obj.add(1)', 'cls.make(1)', 'cls.twice(1)'):
+        for cls in (Plain, Checked):
+            number, time = timeit.Timer(
+                stmt,
+                globals={'cls': cls, 'obj': cls(1)}
+            ).autorange()
+            print(f"{cls.__name__}\t{stmt}\t{time / number * 1e9:.0f} ns")
@@ -3,11 +3,13 @@
 import sys
 import warnings
 import inspect
-import typing
 
 from . import utils, singletons
 from .enums import Attribute
+from .checks import compile_annotation
 from .functions import register as register_functions
+from .functions import (check_batch, BatchValueError, memory_report,
+                        type_profiles)
 from .classes import register as register_classes
 
 ########################
@@ -22,6 +24,10 @@ class ModuleGlobals(dict):
     3.5 this isn't necessary because they hadn't done as much optimisation, but
     now they have this is necessary.
     __strict__'s values are OR'd Attributes.
+
+    There's also __strict_checks__, which maps annotated names to their
+    compiled checks (see ModuleAnnotations). Assignments to those names are
+    checked; others just pay for the failed lookup.
     """
     __slots__ = ()  # Don't create a __dict__ for this dict!
                     # That would be weird. (And cause a segfault.)
@@ -60,6 +66,16 @@ class ModuleGlobals(dict):
                 if value is strict:
                     del sys.modules["strict"]
                     return
+        if key == '__annotations__' and not isinstance(value,
+                                                       ModuleAnnotations):
+            value = ModuleAnnotations(self, value)
+        # Checked before the set hooks and descriptors get the value, so
+        # annotated globals holding functions are checked too.
+        check = super().__getitem__('__strict_checks__').get(key)
+        if check is not None and not matches(check, value):
+            annotation = super().__getitem__('__annotations__')[key]
+            raise ValueError(f"Global {key!r} is of type {type(value)!r}, "
+                             f"not {annotation!r}")
         try:
             item = super().__getitem__(key)  # Get the actual stored object
         except KeyError:
@@ -80,7 +96,6 @@ class ModuleGlobals(dict):
                     __strict__[key] = attribute
                     return
         # Set hooks don't exist, so just set the item.
-        # Make sure you check the type against __annotations__!
         super().__setitem__(key, value)
         __strict__[key] = Attribute.NONE
 
@@ -93,6 +108,45 @@ class ModuleGlobals(dict):
 
 singletons.ModuleGlobals = ModuleGlobals
 
+class ModuleAnnotations(dict):
+    """Drop-in replacement for a strict module's __annotations__.
+
+    Each annotation is compiled into a check when it's added, and that's
+    stored in the module's __strict_checks__ for ModuleGlobals.__setitem__.
+    x: int = 5 stores x before annotating it, so the value that's already
+    there is checked here too."""
+    __slots__ = ('namespace', 'checks')
+
+    def __init__(self, namespace: ModuleGlobals, annotations: dict=()):
+        super().__init__()
+        self.namespace = namespace
+        self.checks = dict.__getitem__(namespace, '__strict_checks__')
+        for key, annotation in dict(annotations).items():
+            self[key] = annotation
+
+    def __setitem__(self, key, annotation):
+        check = compile_annotation(annotation, self.namespace)
+        if dict.__contains__(self.namespace, key):
+            value = dict.__getitem__(self.namespace, key)
+            if (dict.__getitem__(self.namespace, '__strict__')
+                    .get(key, Attribute.NONE) & Attribute.DESCRIPTOR):
+                module = sys.modules[dict.__getitem__(self.namespace,
+                                                      '__name__')]
+                value = value.__get__(module, module)
+            if not matches(check, value):
+                raise ValueError(f"Global {key!r} is of type "
+                                 f"{type(value)!r}, not {annotation!r}")
+        super().__setitem__(key, annotation)
+        self.checks[key] = check
+
+def matches(check, value) -> bool:
+    try:
+        return check(value)
+    except NameError:
+        # A forward reference to something that isn't defined yet. It'll be
+        # checked on the first assignment after it is.
+        return True
+
 set_hooks = {}
 singletons.set_hooks = set_hooks
 
@@ -106,8 +160,11 @@ register_classes()
 # Setup #
 #########
 if __name__ == "strict":
-    typing.TYPE_CHECKING = True  # Does nothing in and of itself...
-                                 # but it's a documented signal.
+    # The standard library's typing; in this package, typing means
+    # strict.typing once that's been imported.
+    sys.modules['typing'].TYPE_CHECKING = True  # Does nothing in and of
+                                                # itself... but it's a
+                                                # documented signal.
 
     # Get target module
     target_name = utils.get_target_name()
@@ -115,16 +172,31 @@ if __name__ == "strict":
     warnings.warn(f"You are importing strict from {target_name}!",
                   category=ImportWarning, stacklevel=2)
 
-    # Rewrite globals to be a ModuleGlobals subclass
-    utils.reclass_object(target.__dict__, ModuleGlobals)
-    dict.__setitem__(target.__dict__, '__strict__',
-                     {'__strict__': Attribute.NONE,
-                      '__name__': Attribute.NONE})  # Set __strict__.
+    # If this is importlib.reload re-running import strict, everything that
+    # was already set up is still there, and everything since has been run
+    # through __setitem__ already. Only new modules need setting up, but
+    # reloaded ones start their annotations over, so that only the new code's
+    # are checked.
+    if utils.is_strict_module(target):
+        if utils.is_reloading(target):
+            dict.__getitem__(target.__dict__, '__strict_checks__').clear()
+            if dict.__contains__(target.__dict__, '__annotations__'):
+                dict.__setitem__(target.__dict__, '__annotations__',
+                                 ModuleAnnotations(target.__dict__))
+    else:
+        # Rewrite globals to be a ModuleGlobals subclass
+        utils.reclass_object(target.__dict__, ModuleGlobals)
+        dict.__setitem__(target.__dict__, '__strict__',
+                         {'__strict__': Attribute.NONE,
+                          '__strict_checks__': Attribute.NONE,
+                          '__name__': Attribute.NONE})  # Set __strict__.
+        dict.__setitem__(target.__dict__, '__strict_checks__', {})
 
     # Retcon import strict
-    for key in target.__dict__:
-        # Run __setitem__ on everything
-        if key not in ('__name__', '__strict__'):
+    __strict__ = dict.__getitem__(target.__dict__, '__strict__')
+    for key in list(target.__dict__):
+        # Run __setitem__ on everything that hasn't been
+        if key not in __strict__:
             value = dict.__getitem__(target.__dict__, key)
             dict.__delitem__(target.__dict__, key)
             target.__dict__[key] = value
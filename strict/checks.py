@@ -0,0 +1,209 @@
+"""Strictpy annotation compilation.
+
+compile_annotation turns an annotation (a class, a typing construct, a PEP 585
+or PEP 604 alias, one of .typing's types or a forward reference) into a check:
+a callable that takes an object and returns whether it matches. This is done
+once, when the function is defined, so calls don't have to go back through
+__instancecheck__ dispatch for every construct.
+"""
+
+import types
+import typing
+import abc
+import collections.abc
+
+from . import typing as strict_typing
+
+__all__ = ['Check', 'compile_annotation', 'has_forward_ref',
+           'depends_only_on_type']
+
+Check = typing.Callable[[object], bool]
+
+_UnionType = getattr(types, 'UnionType', None)  # Python 3.10+ int | str
+_Literal = getattr(typing, 'Literal', None)     # Python 3.8+
+_Final = getattr(typing, 'Final', None)         # Python 3.8+
+_Self = getattr(typing, 'Self', None)           # Python 3.11+
+_LiteralString = getattr(typing, 'LiteralString', None)  # Python 3.11+
+_Never = getattr(typing, 'Never', None)         # Python 3.11+
+
+def compile_annotation(annotation: object,
+                       globalns: typing.Optional[dict]=None) -> Check:
+    """Compile annotation into a check.
+
+    Forward references are resolved in globalns the first time the check is
+    used, and the result is kept."""
+    if annotation is None or annotation is type(None):
+        return _is_none
+    if isinstance(annotation, (str, typing.ForwardRef)):
+        return _ForwardRef(getattr(annotation, '__forward_arg__', annotation),
+                           globalns)
+    if annotation is typing.Any or annotation is strict_typing.Any:
+        return _anything
+    if (annotation is typing.NoReturn
+            or _Never is not None and annotation is _Never):
+        return _nothing
+    if _LiteralString is not None and annotation is _LiteralString:
+        return _instancecheck(str)
+    if _Self is not None and annotation is _Self:
+        # Which class that is depends on where the function's defined, which
+        # isn't known here.
+        return _anything
+    if annotation is strict_typing.Callable:
+        return callable
+    if isinstance(annotation, strict_typing._DifferentiatedCallable):
+        return annotation.__instancecheck__
+    if isinstance(annotation, strict_typing.Union):
+        return _compile_union(annotation._types, globalns)
+    if isinstance(annotation, strict_typing.ClassVar):
+        return compile_annotation(annotation.type, globalns)
+    if isinstance(annotation, strict_typing._DifferentiatedTuple):
+        return _compile_tuple(annotation._types, globalns)
+    if _UnionType is not None and isinstance(annotation, _UnionType):
+        return _compile_union(annotation.__args__, globalns)
+    if isinstance(annotation, typing.TypeVar):
+        if annotation.__bound__ is not None:
+            return compile_annotation(annotation.__bound__, globalns)
+        if annotation.__constraints__:
+            return _compile_union(annotation.__constraints__, globalns)
+        return _anything
+    if hasattr(annotation, '__supertype__'):  # typing.NewType
+        return compile_annotation(annotation.__supertype__, globalns)
+    if hasattr(annotation, '__metadata__'):  # typing.Annotated
+        return compile_annotation(annotation.__origin__, globalns)
+
+    origin = getattr(annotation, '__origin__', None)
+    if origin is not None:
+        return _compile_generic(origin, getattr(annotation, '__args__', ()),
+                                globalns)
+    if isinstance(annotation, type):
+        return _instancecheck(annotation)
+    # Some typing special form we don't know about.
+    return _anything
+
+def has_forward_ref(annotation: object) -> bool:
+    """Whether the meaning of annotation depends on the namespace it's
+    resolved in."""
+    if isinstance(annotation, (str, typing.ForwardRef)):
+        return True
+    args = getattr(annotation, '__args__', None)
+    if isinstance(args, tuple):
+        return any(map(has_forward_ref, args))
+    return False
+
+def depends_only_on_type(annotation: object) -> bool:
+    """Whether annotation's check passes or fails for every object of a given
+    type alike, so that checking type(obj) is enough."""
+    if (annotation is None or annotation is typing.Any
+            or annotation is strict_typing.Any):
+        return True
+    if isinstance(annotation, strict_typing.Union):
+        return all(map(depends_only_on_type, annotation._types))
+    if isinstance(annotation, strict_typing.ClassVar):
+        return depends_only_on_type(annotation.type)
+    if (_UnionType is not None and isinstance(annotation, _UnionType)
+            or getattr(annotation, '__origin__', None) is typing.Union):
+        return all(map(depends_only_on_type, annotation.__args__))
+    return (isinstance(annotation, type)
+            and not hasattr(annotation, '__origin__')
+            and type(annotation).__instancecheck__ in (
+                type.__instancecheck__, abc.ABCMeta.__instancecheck__))
+
+def _instancecheck(cls: type) -> Check:
+    # Looked up on the metaclass, since cls.__instancecheck__ could be meant
+    # for cls's instances. For ordinary classes this is a bound builtin
+    # method, so there's no Python frame per check.
+    return type(cls).__instancecheck__.__get__(cls, type(cls))
+
+def _is_none(obj):
+    return obj is None
+
+def _anything(obj):
+    return True
+
+def _nothing(obj):
+    return False
+
+class _ForwardRef:
+    __slots__ = ('name', 'globalns', 'check')
+
+    def __init__(self, name: str, globalns: typing.Optional[dict]):
+        self.name = name
+        self.globalns = globalns
+        self.check = None
+
+    def __call__(self, obj):
+        check = self.check
+        if check is None:
+            check = self.check = self.resolve()
+        return check(obj)
+
+    def resolve(self) -> Check:
+        if self.globalns is None:
+            raise NameError(f"Can't resolve forward reference {self.name!r} "
+                            f"without a namespace")
+        return compile_annotation(eval(self.name, self.globalns),
+                                  self.globalns)
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self.name!r})"
+
+def _compile_union(members: typing.Iterable[object],
+                   globalns: typing.Optional[dict]) -> Check:
+    members = tuple(members)
+    if all(isinstance(member, type) and not hasattr(member, '__origin__')
+           for member in members):
+        return lambda obj: isinstance(obj, members)
+    checks = tuple(compile_annotation(member, globalns)
+                   for member in members)
+    return lambda obj: any(check(obj) for check in checks)
+
+def _compile_tuple(args: typing.Sequence[object],
+                   globalns: typing.Optional[dict]) -> Check:
+    if len(args) == 2 and args[1] is Ellipsis:
+        item = compile_annotation(args[0], globalns)
+        return lambda obj: isinstance(obj, tuple) and all(map(item, obj))
+    if args == ((),):  # typing.Tuple[()] on older Pythons
+        args = ()
+    checks = tuple(compile_annotation(arg, globalns) for arg in args)
+    return lambda obj: (isinstance(obj, tuple)
+                        and len(obj) == len(checks)
+                        and all(check(x) for check, x in zip(checks, obj)))
+
+def _compile_generic(origin: object, args: typing.Sequence[object],
+                     globalns: typing.Optional[dict]) -> Check:
+    if origin is typing.Union:
+        return _compile_union(args, globalns)
+    if origin is typing.ClassVar or _Final is not None and origin is _Final:
+        return compile_annotation(args[0], globalns)
+    if _Literal is not None and origin is _Literal:
+        return lambda obj: any(obj == value and type(obj) is type(value)
+                               for value in args)
+    if not isinstance(origin, type):
+        # Some typing special form we don't know about.
+        return _anything
+    if origin is tuple:
+        if not args:
+            return _instancecheck(tuple)
+        return _compile_tuple(args, globalns)
+    if origin is type:
+        if not args or args[0] is typing.Any:
+            return _instancecheck(type)
+        if isinstance(args[0], type):
+            base = args[0]
+            return lambda obj: isinstance(obj, type) and issubclass(obj, base)
+        return _instancecheck(type)
+
+    if (args and len(args) == 2
+            and issubclass(origin, collections.abc.Mapping)):
+        key = compile_annotation(args[0], globalns)
+        value = compile_annotation(args[1], globalns)
+        return lambda obj: (isinstance(obj, origin)
+                            and all(map(key, obj.keys()))
+                            and all(map(value, obj.values())))
+    if (args and len(args) == 1
+            and issubclass(origin, collections.abc.Collection)
+            and not issubclass(origin, (str, bytes))):
+        # Only Collections: checking an Iterator's items would consume it.
+        item = compile_annotation(args[0], globalns)
+        return lambda obj: isinstance(obj, origin) and all(map(item, obj))
+    return _instancecheck(origin)
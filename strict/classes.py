@@ -7,6 +7,9 @@ protected means that it can be accessed from the class, subclasses and anywhere
 
 In Python, these are __attribute and _attribute, respectively. Calling this
 module's register function will cause builtins.__build_class__ to be rewritten.
+
+Methods, classmethods and staticmethods of classes in strict modules are type
+checked, in the same way as functions (see .functions).
 """
 
 import builtins
@@ -15,9 +18,12 @@ import sys
 import re
 import typing
 import itertools
+import inspect
 import types
+import warnings
 
 from .utils import get_target_name, is_strict_module
+from .functions import FunctionDescriptor
 
 __all__ = ['register']
 
@@ -25,15 +31,58 @@ def register():
     builtins.__build_class__ = build_class
 
 def build_class(func, name, *bases, metaclass=None, **kwds):
-    if is_strict_module(sys.modules[func.__module__]):
+    strict = is_strict_module(sys.modules[func.__module__])
+    if strict:
         if bases and bases[-1] == object:
             bases = bases[-1:] + (PrivateProtectedClass, object)
         else:
             bases += PrivateProtectedClass,
     if metaclass is None:
-        return __build_class__(func, name, *bases, **kwds)
+        cls = __build_class__(func, name, *bases, **kwds)
     else:
-        return __build_class__(func, name, *bases, metaclass=metaclass, **kwds)
+        cls = __build_class__(func, name, *bases, metaclass=metaclass, **kwds)
+    if strict:
+        check_methods(cls)
+    return cls
+
+def check_methods(cls: type) -> None:
+    """Replace cls's methods with type checked ones.
+
+    Each method's checker is built once, here. Plain functions are replaced
+    with plain (checked) functions, so they still bind like normal methods,
+    without a new wrapper per access; classmethods and staticmethods are
+    rewrapped. Methods with no annotations at all (unittest's test methods,
+    say) are left alone, and partly annotated ones are left alone with a
+    warning; __init__ can leave out -> None."""
+    for key, value in list(vars(cls).items()):
+        if isinstance(value, (classmethod, staticmethod)):
+            f = value.__func__
+            # __new__ is an implicit staticmethod that still takes cls.
+            method = isinstance(value, classmethod) or key == '__new__'
+            wrap = type(value)
+        else:
+            f = value
+            method = True
+            wrap = None
+        if (not isinstance(f, types.FunctionType)
+                or not f.__annotations__
+                or hasattr(f, '__descriptor__')):  # Already checked.
+            continue
+        c = f.__code__
+        annotations = f.__annotations__
+        missing = (set(c.co_varnames[int(method):c.co_argcount
+                                                 + c.co_kwonlyargcount])
+                   | {'return'}) - set(annotations)
+        if missing == {'return'} and key == '__init__':
+            annotations = {**annotations, 'return': None}
+        elif missing:
+            warnings.warn(f"{cls.__qualname__}.{key} isn't fully annotated "
+                          f"(missing {', '.join(sorted(missing))}), so it "
+                          f"won't be type checked",
+                          category=RuntimeWarning, stacklevel=3)
+            continue
+        checked = FunctionDescriptor(f, method, annotations).wrapper
+        setattr(cls, key, checked if wrap is None else wrap(checked))
 
 private_regex = re.compile(r'_(?P<class>.*?)__(?P<name>.*)')
 
@@ -106,6 +155,8 @@ def climb_super_chain(mro: typing.Sequence[type], name: str,
 def method_defined_on(cls: type, frame: types.FrameType) -> bool:
     c = frame.f_code
     for thing in vars(cls).values():
+        # Look through check_methods' wrappers, and classmethods etc.
+        thing = inspect.unwrap(getattr(thing, '__func__', thing))
         if getattr(thing, '__code__', None) is c:
             return True
     return False
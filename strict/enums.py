@@ -2,9 +2,14 @@
 
 import enum
 
-__all__ = ['Attribute']
+__all__ = ['Attribute', 'Specialisation']
 
 class Attribute(enum.Flag):
     NONE = 0
     DESCRIPTOR = enum.auto()
     UNOPTIMISABLE = enum.auto()
+
+class Specialisation(enum.Enum):
+    PROFILING = enum.auto()
+    MONOMORPHIC = enum.auto()
+    POLYMORPHIC = enum.auto()
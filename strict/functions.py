@@ -8,18 +8,38 @@ import textwrap
 import ast
 import typing
 import functools
+import itertools
+import weakref
 
-from .enums import Attribute
+from .enums import Attribute, Specialisation
+from .checks import (Check, compile_annotation, has_forward_ref,
+                     depends_only_on_type)
+from .utils import is_strict_module, is_reloading
 from . import singletons
 
-__all__ = ['register']
+__all__ = ['register', 'check_batch', 'BatchValueError', 'memory_report',
+           'type_profiles']
+
+# Type feedback: once a strict function has been called this many times,
+# always with the same argument types, it gets a fast path that only checks
+# type(arg) is T. After missing that guard this many times, it goes back to
+# full checks for good. None turns specialisation off.
+specialise_after: typing.Optional[int] = 1000
+deoptimise_after: int = 10
 
 def register() -> None:
     singletons.set_hooks[types.FunctionType] = function_hook
 
 class Prototype:
+    """The signature of a strict function.
+
+    Prototypes are hashable, and FunctionDescriptor interns them, so every
+    function with the same signature shares one Prototype, and therefore one
+    checker. The annotations are compiled into checks (see .checks) up front;
+    checks, kwchecks and retcheck are what's actually run on each call."""
     __slots__ = ('margs', 'oargs', 'mkwargs', 'okwargs', 'args', 'kwargs',
-                 'ret')
+                 'ret', 'globalns', 'checks', 'kwchecks', 'retcheck',
+                 'specialisable', '_hash', '__weakref__')
     margs: typing.Sequence[typing.Tuple[str, typing.Tuple[type]]]
     oargs: typing.Sequence[typing.Tuple[str, typing.Tuple[type, object]]]
     mkwargs: typing.Mapping[str, typing.Tuple[type]]
@@ -27,71 +47,272 @@ class Prototype:
     args: bool    # Doesn't do typechecking on this...
     kwargs: bool  # Or this.
     ret: typing.Tuple[type]
+    # Only set if there are forward references; they mean different things
+    # in different modules.
+    globalns: typing.Optional[dict]
+    checks: typing.Tuple[Check, ...]     # margs, then oargs.
+    kwchecks: typing.Mapping[str, Check]  # Every argument, by name.
+    retcheck: Check
+    # Whether every positional argument's and the return value's checks
+    # only depend on their types; see TypeProfile.
+    specialisable: bool
 
-    def __init__(self, f: types.FunctionType):
+    # Interned Prototypes, as weak references bucketed by hash, so that
+    # reloads and Callable's introspection don't keep them all alive.
+    _interned: typing.ClassVar[typing.Dict[int, typing.List[weakref.ref]]] = {}
+
+    def __init__(self, f: types.FunctionType, method: bool=False,
+                 annotations: typing.Optional[dict]=None,
+                 check_defaults: bool=True):
         c = f.__code__
         argnames = c.co_varnames[:c.co_argcount]
         kwargnames = c.co_varnames[c.co_argcount :
                                    c.co_argcount + c.co_kwonlyargcount]
+        if annotations is None:
+            annotations = f.__annotations__
+        if method and argnames:
+            # self or cls needn't be annotated.
+            annotations = {argnames[0]: typing.Any, **annotations}
         try:
             noargs = len(f.__defaults__)
         except TypeError:
             noargs = 0
-        self.margs = tuple((k, (f.__annotations__[k],))
-                           for k in argnames[:-noargs])
+        self.margs = tuple((k, (annotations[k],))
+                           for k in argnames[:len(argnames) - noargs])
         if noargs:
-            self.oargs = tuple((k, (f.__annotations__[k], f.__defaults__[i]))
+            self.oargs = tuple((k, (annotations[k], f.__defaults__[i]))
                                for i, k in enumerate(argnames[-noargs:]))
         else:
-            self.oargs = {}
+            self.oargs = ()
 
-        try:
-            nokwargs = len(f.__kwdefaults__)
-        except TypeError:
-            nokwargs = 0
-        self.mkwargs = {k: (f.__annotations__[k],)
-                        for k in kwargnames[:-nokwargs]}
-        if nokwargs:
-            self.okwargs = {k: (f.__annotations__[k], f.__defaults__[i])
-                            for i, k in enumerate(kwargnames[-nokwargs:])}
-        else:
-            self.okwargs = {}
+        kwdefaults = f.__kwdefaults__ or {}
+        self.mkwargs = {k: (annotations[k],)
+                        for k in kwargnames if k not in kwdefaults}
+        self.okwargs = {k: (annotations[k], kwdefaults[k])
+                        for k in kwargnames if k in kwdefaults}
 
-        self.args = c.co_flags | 0x0004 > 0
-        self.kwargs = c.co_flags | 0x0008 > 0
-        self.ret = f.__annotations__['return'],
+        self.args = (c.co_flags & 0x0004) > 0
+        self.kwargs = (c.co_flags & 0x0008) > 0
+        self.ret = annotations['return'],
+
+        if any(map(has_forward_ref, annotations.values())):
+            self.globalns = f.__globals__
+        else:
+            self.globalns = None
+        compiled = {name: compile_annotation(annotation, f.__globals__)
+                    for name, annotation in annotations.items()}
+        self.checks = tuple(compiled[name] for name, _ in self.margs
+                                                          + self.oargs)
+        self.kwchecks = {name: compiled[name]
+                         for name in argnames + kwargnames}
+        self.retcheck = compiled['return']
+        self.specialisable = all(
+            depends_only_on_type(annotations[name])
+            for name in argnames + ('return',))
 
         # Type checking for defaults
-        for name, (type_, default) in self.oargs:
-            if not isinstance(default, type_):
-                raise ValueError(f"Default value for {name!r} is of type "
-                                 f"{type(default)!r}, not {type_!r}")
-        for name, (type_, default) in self.okwargs.items():
-            if not isinstance(default, type_):
+        if not check_defaults:
+            return
+        for name, (type_, default) in itertools.chain(self.oargs,
+                                                      self.okwargs.items()):
+            try:
+                ok = compiled[name](default)
+            except NameError:
+                # Forward reference to something that isn't defined yet.
+                continue
+            if not ok:
                 raise ValueError(f"Default value for {name!r} is of type "
                                  f"{type(default)!r}, not {type_!r}")
 
+    @classmethod
+    def interned(cls, f: types.FunctionType, method: bool=False,
+                 annotations: typing.Optional[dict]=None,
+                 check_defaults: bool=True) -> 'Prototype':
+        """Get the shared Prototype equal to f's."""
+        prototype = cls(f, method, annotations, check_defaults)
+        try:
+            key = hash(prototype)
+        except TypeError:
+            # Unhashable annotation; this one just doesn't get shared.
+            return prototype
+        bucket = cls._interned.setdefault(key, [])
+        for ref in bucket:
+            other = ref()
+            if other is not None and other == prototype:
+                return other
+        bucket.append(weakref.ref(prototype,
+                                  functools.partial(cls._forget, key)))
+        return prototype
+
+    @classmethod
+    def _forget(cls, key: int, ref: weakref.ref) -> None:
+        bucket = cls._interned.get(key, [])
+        if ref in bucket:
+            bucket.remove(ref)
+        if not bucket:
+            cls._interned.pop(key, None)
+
+    @classmethod
+    def introspect(cls, f: types.FunctionType) -> 'Prototype':
+        """Get the shared Prototype of a function that isn't strict, taking
+        anything that isn't annotated to be Any. Its defaults aren't held to
+        their annotations (def f(ctx: dict = None) is fine)."""
+        c = f.__code__
+        annotations = dict.fromkeys(
+            c.co_varnames[:c.co_argcount + c.co_kwonlyargcount]
+            + ('return',),
+            typing.Any)
+        annotations.update(f.__annotations__)
+        return cls.interned(f, annotations=annotations, check_defaults=False)
+
     def __eq__(self, other):
-        return (self.margs == other.margs
-                and self.oargs == other.oargs
-                and self.mkwargs == other.mkwargs
-                and self.okwargs == other.okwargs
-                and self.args == other.args
-                and self.kwargs == other.kwargs)
+        if self is other:
+            return True
+        if not isinstance(other, Prototype):
+            return NotImplemented
+        return (self.globalns is other.globalns
+                and self._signature() == other._signature())
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            pass
+        margs, oargs, mkwargs, okwargs, *rest = self._signature()
+        self._hash = hash((margs, oargs, frozenset(mkwargs.items()),
+                           frozenset(okwargs.items()), *rest,
+                           id(self.globalns)))
+        return self._hash
+
+    def _signature(self) -> tuple:
+        # Defaults are left out: they needn't be hashable or comparable, and
+        # the checks don't use them.
+        return (tuple((k, t[0]) for k, t in self.margs),
+                tuple((k, t[0]) for k, t in self.oargs),
+                {k: t[0] for k, t in self.mkwargs.items()},
+                {k: t[0] for k, t in self.okwargs.items()},
+                self.args, self.kwargs, self.ret)
+
+    def check_args(self, args: tuple, kwargs: dict) -> None:
+        for i, (arg, check) in enumerate(zip(args, self.checks)):
+            if not check(arg):
+                raise ValueError(self.argument_error(i, arg))
+
+        if kwargs:
+            kwchecks = self.kwchecks
+            for name, kwarg in kwargs.items():
+                check = kwchecks.get(name)
+                if check is not None and not check(kwarg):
+                    raise ValueError(self.keyword_argument_error(name, kwarg))
+
+    def check_ret(self, ret: object) -> None:
+        if not self.retcheck(ret):
+            raise ValueError(f"Return value is of type {type(ret)!r}, not "
+                             f"{self.ret[0]!r}")
+
+    def argument_error(self, i: int, arg: object) -> str:
+        if i < len(self.margs):
+            kind, params = "Mandatory", self.margs
+        else:
+            kind, params = "Optional", self.oargs
+            i -= len(self.margs)
+        return (f"{kind} argument #{i} is of type {type(arg)!r}, not "
+                f"{params[i][1][0]!r}")
+
+    def keyword_argument_error(self, name: str, kwarg: object) -> str:
+        params = dict(self.margs, **self.mkwargs)
+        if name in params:
+            kind = "Mandatory"
+        else:
+            kind = "Optional"
+            params = dict(self.oargs, **self.okwargs)
+        return (f"{kind} argument {name!r} is of type {type(kwarg)!r}, not "
+                f"{params[name][0]!r}")
+
+class TypeProfile:
+    """The argument types one strict function has been called with.
+
+    Only calls without keyword arguments are profiled. While PROFILING, every
+    checked call is counted by its argument types. If, after specialise_after
+    calls, only one set of types has been seen, the profile becomes
+    MONOMORPHIC and guard holds those types: calls whose argument types are
+    exactly guard skip the full check. Calls that miss the guard are checked
+    and counted as usual, and after deoptimise_after misses the profile
+    becomes POLYMORPHIC, which means full checks and no more profiling."""
+    __slots__ = ('state', 'seen', 'guard', 'ret', 'hits', 'misses')
+    state: Specialisation
+    seen: typing.Dict[typing.Tuple[type, ...], int]
+    guard: typing.Optional[typing.Tuple[type, ...]]
+    ret: typing.Optional[type]  # Return type for the fast path.
+    hits: int
+    misses: int
+
+    def __init__(self, prototype: Prototype):
+        if prototype.specialisable and specialise_after is not None:
+            self.state = Specialisation.PROFILING
+        else:
+            self.state = Specialisation.POLYMORPHIC
+        self.seen = {}
+        self.guard = None
+        self.ret = None
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, args: tuple, ret: object) -> None:
+        """Count a fully checked call."""
+        types_ = tuple(map(type, args))
+        self.seen[types_] = self.seen.get(types_, 0) + 1
+        if self.state is Specialisation.PROFILING:
+            if len(self.seen) > 1:
+                self.state = Specialisation.POLYMORPHIC
+            elif sum(self.seen.values()) >= specialise_after:
+                self.state = Specialisation.MONOMORPHIC
+                self.guard = types_
+                self.ret = type(ret)
+        elif self.state is Specialisation.MONOMORPHIC:
+            self.misses += 1
+            if self.misses >= deoptimise_after:
+                self.state = Specialisation.POLYMORPHIC
+                self.guard = None
+
+    def dump(self) -> typing.Dict[str, object]:
+        return {
+            'state': self.state.name,
+            'seen': {tuple(t.__qualname__ for t in types_): calls
+                     for types_, calls in self.seen.items()},
+            'guard': (None if self.guard is None
+                      else tuple(t.__qualname__ for t in self.guard)),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
 
 class FunctionDescriptor:
-    def __init__(self, f):
-        if not all(name in f.__annotations__ for name in
-                   f.__code__.co_varnames[:f.__code__.co_argcount
-                                           + f.__code__.co_kwonlyargcount]
+    __slots__ = ('prototype', 'function', 'wrapper', 'profile', 'method',
+                 'name')
+    prototype: Prototype
+    function: types.FunctionType
+    wrapper: typing.Callable
+    profile: TypeProfile
+    method: bool  # Whether f is a method; see .classes.check_methods.
+
+    def __init__(self, f, method: bool=False,
+                 annotations: typing.Optional[dict]=None):
+        if annotations is None:
+            annotations = f.__annotations__
+        if not all(name in annotations for name in
+                   f.__code__.co_varnames[int(method):f.__code__.co_argcount
+                                                + f.__code__.co_kwonlyargcount]
                    + ("return",)):
             raise ValueError("Your function needs annotations!")
 
         # Set prototype from f.__code__.co_varnames and __annotations__
-        self.prototype = Prototype(f)
+        self.prototype = Prototype.interned(f, method, annotations)
+        self.method = method
 
         # TODO: Create a copy of the function, preserving variable annotations
         self.function = f
+        self.profile = TypeProfile(self.prototype)
+        self.wrapper = self.make_wrapper()
         return
 
         try:
@@ -112,50 +333,72 @@ class FunctionDescriptor:
 
             self.function = f
 
+    def make_wrapper(self) -> typing.Callable:
+        """Build the checked wrapper once; __get__ hands out the same one."""
+        function = self.function
+        check_args = self.prototype.check_args
+        check_ret = self.prototype.check_ret
+        profile = self.profile
+        name = function.__name__
+        if self.method and name[:2] == '__' == name[-2:]:
+            # Binary dunders return NotImplemented to defer to the other
+            # operand, whatever their annotation says.
+            check_annotated_ret = check_ret
+            def check_ret(ret):
+                if ret is not NotImplemented:
+                    check_annotated_ret(ret)
 
-    def __get__(self, instance, type_):
-        @functools.wraps(self.function)
+        polymorphic = Specialisation.POLYMORPHIC
+        # The fast path's state, copied out of profile whenever it changes.
+        guard = ret_type = None
+
+        @functools.wraps(function)
         def f(*args, **kwargs):
-            for i, arg in enumerate(args):
-                if i < len(self.prototype.margs):
-                    if not isinstance(arg, self.prototype.margs[i][1][0]):
-                        raise ValueError(f"Mandatory argument #{i} "
-                                         f"is of type {type(arg)!r}, not "
-                                         f"{self.prototype.margs[i][1][0]!r}")
+            nonlocal guard, ret_type
+            # A list, since building one is quicker than building a tuple.
+            if (guard is not None and not kwargs
+                    and [*map(type, args)] == guard):
+                profile.hits += 1
+                ret = function(*args)
+                if type(ret) is not ret_type:
+                    check_ret(ret)
+                return ret
+            check_args(args, kwargs)
+            ret = function(*args, **kwargs)
+            check_ret(ret)
+            if not kwargs and profile.state is not polymorphic:
+                profile.record(args, ret)
+                if profile.guard is not None:
+                    guard, ret_type = list(profile.guard), profile.ret
                 else:
-                    i -= len(self.prototype.margs)
-                    if i >= (len(self.prototype.oargs)):
-                        break
-                    if not isinstance(arg, self.prototype.oargs[i][1][0]):
-                        raise ValueError(f"Optional argument #{i} "
-                                         f"is of type {type(arg)!r}, not "
-                                         f"{self.prototype.oargs[i][1][0]!r}")
-
-            for name, kwarg in kwargs.items():
-                if name in self.prototype.mkwargs:
-                    if not isinstance(kwarg, self.prototype.mkwargs[name][0]):
-                        raise ValueError(f"Mandatory argument {name!r} "
-                                         f"is of type {type(arg)!r}, not "
-                                         f"{self.prototype.mkwargs[name][0]!r}"
-                                         )
-                elif name in self.prototype.okwargs:
-                    if not isinstance(kwarg, self.prototype.okwargs[name][0]):
-                        raise ValueError(f"Optional argument {name!r} "
-                                         f"is of type {type(arg)!r}, not "
-                                         f"{self.prototype.okwargs[name][0]!r}"
-                                         )
-
-            ret = self.function(*args, **kwargs)
-            if not isinstance(ret, self.prototype.ret[0]):
-                raise ValueError(f"Return value is of type {type(ret)!r}, not "
-                                 f"{self.prototype.ret[0]!r}")
+                    guard = None
             return ret
+        f.__descriptor__ = self
         return f
 
+    def __get__(self, instance, type_):
+        return self.wrapper
+
     def __set__(self, instance, value):
-        if self.prototype != Prototype(value):
-            raise ValueError("Conflicting prototype during "
-                             "function reassignment.")
+        """Replace the function in place, keeping this descriptor.
+
+        importlib.reload ends up here for every function it redefines. The
+        prototype (and its checker) is kept if it's equal, and the type
+        profile too if the function does exactly what it did before; the
+        wrapper is always rebuilt, around value. Changing the prototype is
+        only allowed during a reload."""
+        prototype = Prototype.interned(value, self.method)
+        # Not just is: Prototypes with unhashable annotations aren't interned.
+        if prototype is not self.prototype and prototype != self.prototype:
+            if not is_reloading(instance):
+                raise ValueError("Conflicting prototype during "
+                                 "function reassignment.")
+            self.prototype = prototype
+            self.profile = TypeProfile(prototype)
+        elif not _same_body(value, self.function):
+            self.profile = TypeProfile(self.prototype)
+        self.function = value
+        self.wrapper = self.make_wrapper()
 
     def __set_name__(self, owner, name):
         print("This is called!")
@@ -178,6 +421,176 @@ class FunctionDescriptor:
 
         return textwrap.dedent(source_code).strip('\n')
 
+def _same_body(f: types.FunctionType, g: types.FunctionType) -> bool:
+    """Whether f and g run the same code on the same closed-over objects.
+
+    Equal code isn't enough: closures from one factory, or a decorator's
+    wrapper around a reloaded function, share code but not cells."""
+    if f is g:
+        return True
+    if f.__code__ != g.__code__:
+        return False
+    try:
+        return all(a.cell_contents is b.cell_contents
+                   for a, b in zip(f.__closure__ or (), g.__closure__ or ()))
+    except ValueError:  # An empty cell.
+        return False
+
+class BatchValueError(ValueError):
+    """Raised by check_batch; failures maps row index to what was wrong."""
+    failures: typing.Mapping[int, str]
+
+    def __init__(self, failures):
+        self.failures = failures
+        super().__init__(f"{len(failures)} row(s) failed type checking: "
+                         + "; ".join(f"row {i}: {message}"
+                                     for i, message in failures.items()))
+
+def check_batch(f, rows: typing.Iterable, *,
+                columnar: bool=False) -> typing.List[object]:
+    """Call a strict function once per row, type checking the whole batch
+    up front instead of on every call.
+
+    rows is an iterable of positional argument tuples, or, if columnar is
+    set, a sequence of columns (one per positional argument). Columns with a
+    NumPy dtype are checked in one go if NumPy has already been imported.
+    Every failing row is reported at once in a BatchValueError; if none fail,
+    the unchecked function is called for each row. Only positional arguments
+    can be batched, so functions with mandatory keyword arguments can't be.
+    """
+    descriptor = getattr(f, '__descriptor__', None)
+    if descriptor is None:
+        descriptor = FunctionDescriptor(f)
+    prototype = descriptor.prototype
+    if prototype.mkwargs:
+        raise ValueError(f"Can't batch a function with mandatory keyword "
+                         f"arguments {', '.join(prototype.mkwargs)}")
+    params = tuple(prototype.margs) + tuple(prototype.oargs)
+
+    if columnar:
+        columns = list(rows)
+        lengths = {len(column) for column in columns}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have differing lengths {lengths!r}")
+        length = lengths.pop() if lengths else 0
+        failures = _check_arity(prototype, len(columns),
+                                range(length))
+        if not failures:
+            for i, (column, (name, (type_, *_)), check) in enumerate(
+                    zip(columns, params, prototype.checks)):
+                if _check_dtype(column, type_):
+                    continue
+                for j, arg in enumerate(column):
+                    if j not in failures and not check(arg):
+                        failures[j] = prototype.argument_error(i, arg)
+        rows = list(zip(*columns)) if columns else [()] * length
+    else:
+        rows = [tuple(row) for row in rows]
+        failures = {}
+        for j, row in enumerate(rows):
+            failures.update(_check_arity(prototype, len(row), (j,)))
+            if j in failures:
+                continue
+            for i, (arg, check) in enumerate(zip(row, prototype.checks)):
+                if not check(arg):
+                    failures[j] = prototype.argument_error(i, arg)
+                    break
+
+    if failures:
+        raise BatchValueError(dict(sorted(failures.items())))
+
+    function = descriptor.function
+    retcheck = prototype.retcheck
+    results = []
+    for j, row in enumerate(rows):
+        ret = function(*row)
+        if not retcheck(ret):
+            raise ValueError(f"Return value for row {j} is of type "
+                             f"{type(ret)!r}, not {prototype.ret[0]!r}")
+        results.append(ret)
+    return results
+
+def _check_arity(prototype: Prototype, n: int,
+                 indices: typing.Iterable[int]) -> typing.Dict[int, str]:
+    most = len(prototype.margs) + len(prototype.oargs)
+    if n < len(prototype.margs):
+        message = (f"Expected at least {len(prototype.margs)} "
+                   f"arguments, got {n}")
+    elif n > most and not prototype.args:
+        message = f"Expected at most {most} arguments, got {n}"
+    else:
+        return {}
+    return dict.fromkeys(indices, message)
+
+def _check_dtype(column: object, type_: object) -> bool:
+    """Whether column's dtype alone proves every element is a type_.
+
+    Only used if NumPy has already been imported by someone else; a False
+    result just means the elements have to be checked one by one."""
+    numpy = sys.modules.get('numpy')
+    dtype = getattr(column, 'dtype', None)
+    if numpy is None or dtype is None or not isinstance(type_, type):
+        return False
+    # Only if the scalars really are type_s: numpy.float64 is a float, but
+    # numpy.int64 isn't an int, so a strict call would reject it.
+    return issubclass(dtype.type, type_)
+
+def memory_report(module: types.ModuleType) -> typing.Dict[str, int]:
+    """Count a strict module's function descriptors, and how many distinct
+    Prototypes they share, along with their approximate sizes in bytes."""
+    descriptors = [value for value in dict.values(module.__dict__)
+                   if isinstance(value, FunctionDescriptor)]
+    prototypes = {id(d.prototype): d.prototype for d in descriptors}
+    return {
+        'functions': len(descriptors),
+        'prototypes': len(prototypes),
+        'descriptor_bytes': sum(map(sys.getsizeof, descriptors)),
+        'wrapper_bytes': sum(sys.getsizeof(d.wrapper)
+                             + sys.getsizeof(d.wrapper.__dict__)
+                             for d in descriptors),
+        'prototype_bytes': sum(map(_sizeof_prototype, prototypes.values())),
+    }
+
+def type_profiles(module: types.ModuleType
+                  ) -> typing.Dict[str, typing.Dict[str, object]]:
+    """Dump the TypeProfile of each of a strict module's functions and its
+    classes' checked methods."""
+    descriptors = []
+    for value in dict.values(module.__dict__):
+        if isinstance(value, FunctionDescriptor):
+            descriptors.append(value)
+        elif (isinstance(value, type)
+                and value.__module__ == module.__name__):
+            descriptors.extend(_method_descriptors(value))
+    return {descriptor.function.__qualname__: descriptor.profile.dump()
+            for descriptor in descriptors}
+
+def _method_descriptors(cls: type) -> typing.Iterator[FunctionDescriptor]:
+    # See .classes.check_methods for how these are wrapped.
+    for value in vars(cls).values():
+        if (isinstance(value, type)
+                and value.__qualname__.startswith(cls.__qualname__ + '.')):
+            # A nested class.
+            yield from _method_descriptors(value)
+            continue
+        descriptor = getattr(getattr(value, '__func__', value),
+                             '__descriptor__', None)
+        if isinstance(descriptor, FunctionDescriptor):
+            yield descriptor
+
+def _sizeof_prototype(prototype: Prototype) -> int:
+    # Only counts the containers; the types and defaults aren't ours.
+    size = sys.getsizeof(prototype) + sys.getsizeof(prototype.ret)
+    size += sys.getsizeof(prototype.checks) + sys.getsizeof(prototype.kwchecks)
+    for params in (prototype.margs, prototype.oargs):
+        size += sys.getsizeof(params)
+        size += sum(sys.getsizeof(param) + sys.getsizeof(param[1])
+                    for param in params)
+    for params in (prototype.mkwargs, prototype.okwargs):
+        size += sys.getsizeof(params)
+        size += sum(map(sys.getsizeof, params.values()))
+    return size
+
 def function_hook(f: int) -> (FunctionDescriptor, Attribute):
     try:
         module = sys.modules[f.__module__]
@@ -185,6 +598,6 @@ def function_hook(f: int) -> (FunctionDescriptor, Attribute):
         warnings.warn(f"Module {f.__module__} isn't in sys.modules!",
                       category=ImportWarning, stacklevel=3)
     else:
-        if not isinstance(module.__dict__, singletons.ModuleGlobals):
+        if not is_strict_module(module):
             return None
     return FunctionDescriptor(f), Attribute.DESCRIPTOR
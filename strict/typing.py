@@ -2,6 +2,7 @@
 
 import types
 import typing
+import weakref
 from typing import _tp_cache
 import collections.abc
 
@@ -48,17 +49,161 @@ class Any(_Immutable):
     def __subclasscheck__(self, cls):
         return True
 
-class Callable(type, _Immutable):
-    # TODO: Add Callable[] support.
+class _CallableMeta(type):
+    def __instancecheck__(cls, obj):
+        return callable(obj)
+
+    def __subclasscheck__(cls, other):
+        return issubclass(other, collections.abc.Callable)
+
+class Callable(_Immutable, metaclass=_CallableMeta):
+    """Anything callable. Callable[[A, B], R] is anything that can be called
+    with an A and a B, returning an R; Callable[..., R] only checks R."""
     __slots__ = ()
 
+    def __class_getitem__(cls, params):
+        args, ret = params
+        if args is not Ellipsis:
+            args = tuple(args)  # Lists can't be cached.
+        return _differentiated_callable(args, ret)
+
+@_tp_cache
+def _differentiated_callable(args, ret):
+    return _DifferentiatedCallable(args, ret)
+
+class _DifferentiatedCallable(_Immutable):
+    """Callable[[A, B], R].
+
+    Strict functions are checked by comparing their Prototype; other Python
+    functions are introspected once per code object. Whether a Prototype is
+    compatible is then cached, so repeat checks are a dict lookup. Anything
+    else that's callable (builtins, classes...) can't be checked cheaply,
+    so passes."""
+    __slots__ = ('args', 'ret', '_compatible')
+
+    args: 'typing.Union[typing.Tuple[object, ...], type(Ellipsis)]'
+    ret: object
+
+    def __init__(self, args, ret):
+        self.args = args
+        self.ret = ret
+        self._compatible = {}
+
+    def __repr__(self):
+        if self.args is Ellipsis:
+            args = '...'
+        else:
+            args = f"[{', '.join(map(repr, self.args))}]"
+        return f"Callable[{args}, {self.ret!r}]"
+
     def __instancecheck__(self, obj):
-        return callable(obj)
+        if not callable(obj):
+            return False
+        bound = 0
+        if isinstance(obj, types.MethodType):
+            obj, bound = obj.__func__, 1
+        descriptor = getattr(obj, '__descriptor__', None)
+        if descriptor is not None:
+            prototype = descriptor.prototype
+        elif isinstance(obj, types.FunctionType):
+            prototype = _introspect(obj)
+        else:
+            return True
 
-    def __subclasscheck__(self, cls):
-        return (hasattr(cls, '__call__')
-                and not hasattr(type(cls), '__call__')
-                or cls.__call__ != type(cls).__call__(cls))
+        key = prototype, bound
+        try:
+            return self._compatible[key]
+        except KeyError:
+            compatible = self._compatible[key] = self._check(prototype, bound)
+            return compatible
+        except TypeError:  # Unhashable annotations; no caching.
+            return self._check(prototype, bound)
+
+    def _check(self, prototype, bound):
+        if self.args is not Ellipsis:
+            params = (prototype.margs + prototype.oargs)[bound:]
+            if (prototype.mkwargs
+                    or len(self.args) < len(prototype.margs) - bound
+                    or len(self.args) > len(params) and not prototype.args):
+                return False
+            # Parameters have to accept at least what we'll pass them.
+            for expected, (name, (annotation, *_)) in zip(self.args, params):
+                annotation = _resolve(annotation, prototype.globalns)
+                if not _is_subtype(expected, annotation):
+                    return False
+        return _is_subtype(_resolve(prototype.ret[0], prototype.globalns),
+                           self.ret)
+
+_introspected = weakref.WeakKeyDictionary()
+
+def _introspect(f: types.FunctionType):
+    """Get the Prototype of a function that isn't strict, once per code
+    object and signature."""
+    # Closures made by the same factory share their code, but not their
+    # annotations and defaults.
+    signature = (f.__annotations__, f.__defaults__, f.__kwdefaults__,
+                 f.__globals__)
+    try:
+        cached, prototype = _introspected[f.__code__]
+    except KeyError:
+        pass
+    else:
+        try:
+            if all(a is b or a == b for a, b in zip(cached, signature)):
+                return prototype
+        except Exception:  # Defaults needn't be comparable.
+            pass
+    # Not imported at the top, because .functions imports this module.
+    from .functions import Prototype
+    prototype = Prototype.introspect(f)
+    annotations, *rest = signature
+    _introspected[f.__code__] = (dict(annotations), *rest), prototype
+    return prototype
+
+def _resolve(annotation, globalns: typing.Optional[dict]):
+    """annotation, with a forward reference looked up in globalns; Any if it
+    can't be."""
+    if not isinstance(annotation, (str, typing.ForwardRef)):
+        return annotation
+    if globalns is None:
+        return Any
+    try:
+        return eval(getattr(annotation, '__forward_arg__', annotation),
+                    globalns)
+    except Exception:
+        return Any
+
+_UnionType = getattr(types, 'UnionType', None)  # Python 3.10+ int | str
+
+def _union_members(annotation) -> typing.Optional[tuple]:
+    if isinstance(annotation, Union):
+        return annotation._types
+    if (getattr(annotation, '__origin__', None) is typing.Union
+            or _UnionType is not None and isinstance(annotation, _UnionType)):
+        return annotation.__args__
+    return None
+
+def _is_subtype(sub, sup) -> bool:
+    """Whether sub is definitely sup; unknown (Any) counts as yes."""
+    sub, sup = (type(None) if x is None else x for x in (sub, sup))
+    if (sub == sup or sup is object
+            or any(x is typing.Any or x is Any for x in (sub, sup))):
+        return True
+    members = _union_members(sub)
+    if members is not None:
+        return all(_is_subtype(member, sup) for member in members)
+    members = _union_members(sup)
+    if members is not None:
+        return any(_is_subtype(sub, member) for member in members)
+    # typing.List[int] and the like are compared by origin alone.
+    sub = getattr(sub, '__origin__', sub)
+    sup = getattr(sup, '__origin__', sup)
+    if not (isinstance(sub, type) and isinstance(sup, type)):
+        return True  # A forward reference, a TypeVar...
+    try:
+        return issubclass(sub, sup)
+    except TypeError:
+        return True
 
 class ClassVar(_Immutable):
     """Indicates a class, rather than an instance, variable."""
@@ -5,11 +5,9 @@ import itertools
 import ctypes
 import types
 
-from . import singletons
-
 __all__ = ['get_target_name', 'reclass_object', 'magic_set_pointer',
            'magic_get_dict_address', 'magic_get_dict', 'magic_set_dict',
-           'magic_flush_mro_cache', 'is_strict_module']
+           'magic_flush_mro_cache', 'is_strict_module', 'is_reloading']
 
 def get_target_name(depth: int=0) -> str:
     for depth in itertools.count(2 + depth):
@@ -25,7 +23,9 @@ def get_target_name(depth: int=0) -> str:
 
 def reclass_object(obj: object, new_class: type) -> None:
     old_class = obj.__class__
-    for offset in range(0, obj.__sizeof__(),
+    # Not obj.__sizeof__(): for a dict that counts its separately allocated
+    # table, and scanning that far reclasses whatever's next in memory.
+    for offset in range(0, old_class.__basicsize__,
                         ctypes.sizeof(ctypes.c_void_p)):
         # This assumes alignment of the pointers.
         # WARNING: May cause segfault. If it doesn't,
@@ -78,4 +78,18 @@ def magic_flush_mro_cache() -> None:
     ctypes.PyDLL(None).PyType_Modified(ctypes.py_object(object))
 
 def is_strict_module(module: types.ModuleType) -> bool:
-    return isinstance(module.__dict__, singletons.ModuleGlobals)
+    # Not isinstance(module.__dict__, singletons.ModuleGlobals); each time
+    # strict is imported it defines a new ModuleGlobals.
+    return dict.__contains__(module.__dict__, '__strict__')
+
+def is_reloading(module: types.ModuleType) -> bool:
+    """Whether importlib.reload is re-executing module right now."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        # importlib.reload calls _exec; a first import calls _load.
+        if (frame.f_code.co_name == '_exec'
+                and frame.f_globals.get('__name__') == 'importlib._bootstrap'
+                and frame.f_locals.get('module') is module):
+            return True
+        frame = frame.f_back
+    return False
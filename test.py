@@ -14,7 +14,388 @@ class TestTyping(unittest.TestCase):
                     self.assertTrue(all(not isinstance(t(), union)
                                         for t in all_ts
                                         if t not in ts))
-            
+
+    def test_callable(self):
+        from strict.typing import Callable
+        from strict.functions import FunctionDescriptor
+        def f(a: int, b: object) -> bool:
+            return True
+        checked = FunctionDescriptor(f).wrapper
+        handler = Callable[[int, str], bool]
+        self.assertIs(handler, Callable[[int, str], bool])
+        for candidate in (f, checked, lambda a, b: None):
+            with self.subTest(candidate=candidate):
+                self.assertIsInstance(candidate, handler)
+        for candidate in (f, checked, lambda a: None, 1):
+            with self.subTest(candidate=candidate):
+                self.assertNotIsInstance(candidate, Callable[[str, str], bool])
+        self.assertIsInstance(f, Callable[..., int])
+        self.assertNotIsInstance(f, Callable[..., str])
+        self.assertIsInstance(len, Callable)
+        self.assertTrue(issubclass(type(len), Callable))
+        self.assertFalse(issubclass(int, Callable))
+
+    def test_callable_annotations(self):
+        import typing
+        from strict.typing import Callable
+        def optional(a: typing.Optional[int]) -> int:
+            return 0
+        def sequence(a: typing.Sequence[int]) -> int:
+            return 0
+        def with_context(a: int, ctx: dict=None) -> int:
+            return a
+        namespace = {}
+        exec("from __future__ import annotations\n"
+             "def postponed(a: int) -> int:\n"
+             "    return a\n", namespace)
+        postponed = namespace['postponed']
+        def make(T):
+            def callback(x: T) -> T:
+                return x
+            return callback
+        for candidate, handler in (
+                (optional, Callable[[int], int]),
+                (optional, Callable[[typing.Optional[int]], int]),
+                (sequence, Callable[[typing.List[int]], int]),
+                (postponed, Callable[[int], int]),
+                (make(int), Callable[[int], int]),
+                (make(str), Callable[[str], str]),
+                (with_context, Callable[[int], int])):
+            with self.subTest(candidate=candidate, handler=handler):
+                self.assertIsInstance(candidate, handler)
+        for candidate, handler in (
+                (optional, Callable[[str], int]),
+                (sequence, Callable[[typing.Set[int]], int]),
+                (postponed, Callable[[str], int]),
+                (make(int), Callable[[str], str])):
+            with self.subTest(candidate=candidate, handler=handler):
+                self.assertNotIsInstance(candidate, handler)
+
+class TestChecks(unittest.TestCase):
+    def test_compile_annotation(self):
+        import typing
+        from strict.checks import compile_annotation
+        cases = [
+            (typing.List[int], [[], [1, 2]], [[1, "a"], (1,), None]),
+            (typing.Dict[str, int], [{}, {"a": 1}], [{1: 1}, {"a": "b"}]),
+            (typing.Optional[int], [None, 1], ["a"]),
+            (typing.Tuple[int, str], [(1, "a")], [(1,), ("a", 1), [1, "a"]]),
+            (typing.Tuple[int, ...], [(), (1, 2)], [(1, "a")]),
+            (typing.Any, [None, 1, "a"], []),
+            ("int", [1], ["a"]),
+            (typing.NoReturn, [], [None, 1]),
+        ]
+        for name, good, bad in (('LiteralString', ["a"], [1, b"a"]),
+                                ('Never', [], [None, 1]),
+                                ('Self', [None, 1], [])):
+            if hasattr(typing, name):  # Python 3.11+
+                cases.append((getattr(typing, name), good, bad))
+        for annotation, good, bad in cases:
+            check = compile_annotation(annotation, {"int": int})
+            with self.subTest(annotation=annotation):
+                self.assertTrue(all(map(check, good)))
+                self.assertFalse(any(map(check, bad)))
+
+class TestFunctions(unittest.TestCase):
+    def test_check_batch(self):
+        from strict.functions import check_batch, BatchValueError
+        def f(a: int, b: str="x") -> int:
+            return a * 2
+        self.assertEqual(check_batch(f, [(1,), (2, "y")]), [2, 4])
+        self.assertEqual(check_batch(f, [[1, 2], ["a", "b"]], columnar=True),
+                         [2, 4])
+        with self.assertRaises(BatchValueError) as cm:
+            check_batch(f, [(1,), ("a",), (2, 3), ()])
+        self.assertEqual(list(cm.exception.failures), [1, 2, 3])
+        def g(a: int, *, b: str) -> int:
+            return a
+        with self.assertRaises(ValueError):
+            check_batch(g, [(1,)])
+
+    def test_check_batch_dtype(self):
+        import sys
+        import types
+        from unittest import mock
+        from strict.functions import check_batch, BatchValueError
+        class int64:  # Like numpy.int64, this isn't an int.
+            pass
+        class float64(float):
+            pass
+        class Column(list):
+            def __init__(self, values, type_):
+                super().__init__(values)
+                self.dtype = types.SimpleNamespace(type=type_)
+        def f(a: int, b: float) -> int:
+            return 1
+        with mock.patch.dict(sys.modules, numpy=types.ModuleType('numpy')):
+            self.assertEqual(
+                check_batch(f, [[1, 2], Column([1.0, 2.0], float64)],
+                            columnar=True),
+                [1, 1])
+            with self.assertRaises(BatchValueError) as cm:
+                check_batch(f, [Column([int64(), int64()], int64),
+                                [1.0, 2.0]], columnar=True)
+            self.assertEqual(list(cm.exception.failures), [0, 1])
+
+    def test_prototype_interning(self):
+        from strict.functions import Prototype
+        def f(a: int, *, b: str="x") -> int: pass
+        def g(a: int, *, b: str="x") -> int: pass
+        def h(a: int, *, b: str="x") -> str: pass
+        self.assertEqual(Prototype(f), Prototype(g))
+        self.assertEqual(hash(Prototype(f)), hash(Prototype(g)))
+        self.assertIs(Prototype.interned(f), Prototype.interned(g))
+        self.assertIsNot(Prototype.interned(f), Prototype.interned(h))
+
+    def test_interned_prototypes_are_weak(self):
+        import gc
+        from strict.functions import Prototype
+        class Unique:
+            pass
+        def f(a: Unique) -> int: pass
+        key = hash(Prototype.interned(f))
+        gc.collect()
+        self.assertNotIn(key, Prototype._interned)
+
+    def test_incomparable_defaults(self):
+        from strict.functions import Prototype
+        class Array:
+            def __eq__(self, other):
+                raise ValueError("The truth value is ambiguous")
+        def f(a: object=Array()) -> None: pass
+        def g(a: object=Array()) -> None: pass
+        self.assertIs(Prototype.interned(f), Prototype.interned(g))
+
+    def test_unhashable_annotation_reassignment(self):
+        from strict.functions import FunctionDescriptor
+        def f(a: [int]) -> int:
+            return 1
+        descriptor = FunctionDescriptor(f)
+        descriptor.__set__(None, f)
+        self.assertIs(descriptor.function, f)
+
+    def test_type_feedback(self):
+        from unittest import mock
+        from strict import functions
+        from strict.enums import Specialisation
+        def f(a: int) -> int:
+            return a
+        with mock.patch.object(functions, 'specialise_after', 3), \
+             mock.patch.object(functions, 'deoptimise_after', 2):
+            descriptor = functions.FunctionDescriptor(f)
+            g, profile = descriptor.wrapper, descriptor.profile
+            for i in range(3):
+                g(i)
+            self.assertIs(profile.state, Specialisation.MONOMORPHIC)
+            g(1)
+            self.assertEqual(profile.hits, 1)
+            with self.assertRaises(ValueError):
+                g("a")
+            g(True)
+            g(False)
+            self.assertIs(profile.state, Specialisation.POLYMORPHIC)
+            self.assertEqual(profile.dump()['seen'], {('int',): 3,
+                                                      ('bool',): 2})
+
+    def test_function_replacement(self):
+        from strict.functions import FunctionDescriptor
+        def f(a: int) -> int:
+            return a
+        def g(a: int) -> int:
+            return -a
+        def h(a: str) -> str:
+            return a
+        def make(n: int) -> object:
+            def add(a: int) -> int:
+                return a + n
+            return add
+        descriptor = FunctionDescriptor(f)
+        profile = descriptor.profile
+        descriptor.__set__(None, f)
+        self.assertIs(descriptor.profile, profile)
+        descriptor.__set__(None, g)
+        self.assertEqual(descriptor.wrapper(1), -1)
+        with self.assertRaises(ValueError):
+            descriptor.__set__(None, h)
+        # Closures from one factory share code, but aren't the same function.
+        descriptor.__set__(None, make(1))
+        profile = descriptor.profile
+        descriptor.__set__(None, make(100))
+        self.assertEqual(descriptor.wrapper(1), 101)
+        self.assertIsNot(descriptor.profile, profile)
+
+class TestClasses(unittest.TestCase):
+    def test_checked_methods(self):
+        class A:
+            def add(self, y: int) -> int:
+                return y
+            @classmethod
+            def make(cls, y: int) -> int:
+                return y
+            @staticmethod
+            def twice(y: int) -> int:
+                return y * 2
+            def unchecked(self, y):
+                return y
+        a = A()
+        self.assertEqual((a.add(1), A.make(2), a.twice(3)), (1, 2, 6))
+        self.assertEqual(a.unchecked("a"), "a")
+        for method in (a.add, A.make, A.twice):
+            with self.subTest(method=method), self.assertRaises(ValueError):
+                method("a")
+
+    def test_self_annotation(self):
+        import typing
+        if not hasattr(typing, 'Self'):
+            self.skipTest("typing.Self is new in Python 3.11")
+        class C:
+            def copy(self) -> typing.Self:
+                return C()
+        self.assertIsInstance(C().copy(), C)
+
+    def test_not_implemented(self):
+        class B:
+            def __init__(self, x: int):
+                self.x = x
+            def __eq__(self, other: object) -> bool:
+                if not isinstance(other, B):
+                    return NotImplemented
+                return self.x == other.x
+            def get(self) -> int:
+                return NotImplemented
+        self.assertFalse(B(1) == 1)
+        self.assertTrue(B(1) == B(1))
+        with self.assertRaises(ValueError):
+            B("a")
+        with self.assertRaises(ValueError):
+            B(1).get()
+
+    def test_partly_annotated_method(self):
+        with self.assertWarns(RuntimeWarning):
+            class C:
+                def f(self, x: int, y):
+                    return y
+        self.assertEqual(C().f(1, 2), 2)
+        self.assertEqual(C().f("a", 2), 2)
+
+class TestGlobals(unittest.TestCase):
+    def test_annotated_global(self):
+        import sys
+        from strict.utils import is_strict_module
+        if not is_strict_module(sys.modules[__name__]):
+            self.skipTest("strict didn't take over this module")
+        namespace = globals()
+        exec("checked: int = 1\nunchecked = 1", namespace)
+        exec("checked = 2\nunchecked = 'a'", namespace)
+        with self.assertRaises(ValueError):
+            exec("checked = 'a'", namespace)
+        with self.assertRaises(ValueError):
+            exec("unchecked: int", namespace)
+
+    def test_reload(self):
+        import sys
+        import os
+        import tempfile
+        import importlib
+        decorated = ("import functools\n"
+                     "def decorate(f: object) -> object:\n"
+                     "    @functools.wraps(f)\n"
+                     "    def inner(*args):\n"
+                     "        return f(*args)\n"
+                     "    return inner\n"
+                     "@decorate\n"
+                     "def g(a: int) -> int: return a + {}\n")
+        def write(source):
+            with open(os.path.join(directory, 'reloaded.py'), 'w') as f:
+                f.write("import strict\n" + source)
+        with tempfile.TemporaryDirectory() as directory:
+            sys.path.insert(0, directory)
+            dont_write_bytecode = sys.dont_write_bytecode
+            sys.dont_write_bytecode = True
+            try:
+                write("x: int = 1\n"
+                      "def f(a: int) -> int: return a\n"
+                      + decorated.format(1))
+                # The other tests' from strict... imports leave strict in
+                # sys.modules, so import strict wouldn't run it again.
+                sys.modules.pop('strict', None)
+                module = importlib.import_module('reloaded')
+                namespace = module.__dict__
+                descriptor = dict.__getitem__(namespace, 'f')
+                write("x: str = 'a'\n"
+                      "def f(a: str) -> str: return a\n"
+                      + decorated.format(100))
+                importlib.reload(module)
+                self.assertIs(dict.__getitem__(namespace, 'f'), descriptor)
+                self.assertEqual(module.x, 'a')
+                self.assertEqual(namespace['f']('b'), 'b')
+                with self.assertRaises(ValueError):
+                    namespace['f'](1)
+                with self.assertRaises(ValueError):
+                    exec("x = 1", namespace)
+                # The decorator's wrapper has the same code as before, but
+                # wraps the new g.
+                self.assertEqual(namespace['g'](1), 101)
+                write("x: int = 1\n"
+                      "x = 'sneaky'\n")
+                with self.assertRaises(ValueError):
+                    importlib.reload(module)
+                # Annotations dropped from the code aren't checked any more.
+                write("x = 'a'\n")
+                importlib.reload(module)
+                self.assertEqual(module.x, 'a')
+            finally:
+                sys.dont_write_bytecode = dont_write_bytecode
+                sys.path.remove(directory)
+                sys.modules.pop('reloaded', None)
+
+    def test_method_type_profiles(self):
+        import sys
+        from strict.functions import type_profiles
+        from strict.utils import is_strict_module
+        module = sys.modules[__name__]
+        if not is_strict_module(module):
+            self.skipTest("strict didn't take over this module")
+        exec("class Profiled:\n"
+             "    def f(self, a: int) -> int:\n"
+             "        return a\n"
+             "    class Nested:\n"
+             "        @staticmethod\n"
+             "        def g(a: int) -> int:\n"
+             "            return a\n", globals())
+        Profiled().f(1)
+        profiles = type_profiles(module)
+        self.assertEqual(profiles['Profiled.f']['seen'],
+                         {('Profiled', 'int'): 1})
+        self.assertEqual(profiles['Profiled.Nested.g']['seen'], {})
+
+    def test_forward_reference_global(self):
+        import sys
+        from strict.utils import is_strict_module
+        if not is_strict_module(sys.modules[__name__]):
+            self.skipTest("strict didn't take over this module")
+        namespace = globals()
+        exec("registry: 'dict[str, Handler]' = {}", namespace)
+        exec("class Handler: pass", namespace)
+        exec("registry = {'a': Handler()}", namespace)
+        with self.assertRaises(ValueError):
+            exec("registry = {'a': 1}", namespace)
+
+    def test_annotated_function_global(self):
+        import sys
+        from strict.utils import is_strict_module
+        if not is_strict_module(sys.modules[__name__]):
+            self.skipTest("strict didn't take over this module")
+        namespace = globals()
+        exec("from strict.typing import Callable", namespace)
+        exec("def int_callback(x: int) -> int: return x\n"
+             "def str_callback(x: str) -> str: return x\n"
+             "callback: Callable[[int], int] = int_callback", namespace)
+        with self.assertRaises(ValueError):
+            exec("callback = str_callback", namespace)
+        with self.assertRaises(ValueError):
+            exec("str_callback: Callable[[int], int]", namespace)
+
 if __name__ == '__main__':
 ##    unittest.main()
     pass